@@ -5,6 +5,8 @@ Uses equirectangular (Plate Carree) projection where the conversion is linear.
 
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,27 +24,41 @@ class CoordinateConverter:
         self.map_west = config.get("map_west", -180)
         self.map_east = config.get("map_east", 180)
 
+        # Precompute the affine transform: lon = ax * x + bx, lat = ay * y + by
+        # X axis: west to east (left to right)
+        self._ax = (self.map_east - self.map_west) / (self.touch_max_x - self.touch_min_x)
+        self._bx = self.map_west - self.touch_min_x * self._ax
+        # Y axis: north to south (top to bottom)
+        self._ay = (self.map_south - self.map_north) / (self.touch_max_y - self.touch_min_y)
+        self._by = self.map_north - self.touch_min_y * self._ay
+
+        # Clamp bounds (equivalent to clamping the touch position to the panel)
+        self._lon_lo = float(min(self.map_west, self.map_east))
+        self._lon_hi = float(max(self.map_west, self.map_east))
+        self._lat_lo = float(min(self.map_south, self.map_north))
+        self._lat_hi = float(max(self.map_south, self.map_north))
+
     def pixel_to_latlon(self, x: int, y: int) -> tuple[float, float]:
         """Convert touch pixel coordinates to (latitude, longitude).
 
         Returns (lat, lon) where lat is in [-90, 90] and lon is in [-180, 180].
         """
-        touch_width = self.touch_max_x - self.touch_min_x
-        touch_height = self.touch_max_y - self.touch_min_y
-
-        # Normalize to [0, 1]
-        norm_x = (x - self.touch_min_x) / touch_width
-        norm_y = (y - self.touch_min_y) / touch_height
-
-        # Clamp to valid range
-        norm_x = max(0.0, min(1.0, norm_x))
-        norm_y = max(0.0, min(1.0, norm_y))
-
-        # Map to geographic coordinates
-        # X axis: west to east (left to right)
-        longitude = self.map_west + norm_x * (self.map_east - self.map_west)
-        # Y axis: north to south (top to bottom)
-        latitude = self.map_north - norm_y * (self.map_north - self.map_south)
+        longitude = max(self._lon_lo, min(self._lon_hi, self._ax * x + self._bx))
+        latitude = max(self._lat_lo, min(self._lat_hi, self._ay * y + self._by))
 
         logger.debug("Pixel (%d, %d) -> (%.4f, %.4f)", x, y, latitude, longitude)
         return latitude, longitude
+
+    def pixel_to_latlon_batch(
+        self, xs: np.ndarray, ys: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Convert arrays of touch pixel coordinates to (latitudes, longitudes).
+
+        Vectorized counterpart of pixel_to_latlon for bursts of touch samples
+        (e.g. drags). Returns two float64 arrays with the same shape as xs/ys.
+        """
+        longitudes = self._ax * np.asarray(xs, dtype=np.float64) + self._bx
+        latitudes = self._ay * np.asarray(ys, dtype=np.float64) + self._by
+        np.clip(longitudes, self._lon_lo, self._lon_hi, out=longitudes)
+        np.clip(latitudes, self._lat_lo, self._lat_hi, out=latitudes)
+        return latitudes, longitudes
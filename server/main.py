@@ -5,10 +5,14 @@ and streams them to a UPnP speaker.
 """
 
 import asyncio
+import concurrent.futures
 import logging
+import signal
 import sys
+import threading
 from pathlib import Path
 
+import orjson
 import yaml
 
 from coordinates import CoordinateConverter
@@ -18,14 +22,36 @@ from upnp_streamer import UpnpStreamer
 
 logger = logging.getLogger("radiowall")
 
+# Use the libyaml-backed loader when PyYAML was built with it
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+UPNP_CALL_TIMEOUT = 15  # seconds to wait for a play/stop round-trip
+
 
 def load_config() -> dict:
     config_path = Path(__file__).parent / "config.yaml"
     if not config_path.exists():
         logger.error("config.yaml not found. Copy config.example.yaml to config.yaml")
         sys.exit(1)
+
+    # Parsed config is cached as JSON and reused while config.yaml is unchanged
+    mtime = config_path.stat().st_mtime
+    cache_path = config_path.with_suffix(".cache.json")
+    try:
+        cached = orjson.loads(cache_path.read_bytes())
+        if cached["mtime"] == mtime:
+            return cached["config"]
+    except (OSError, orjson.JSONDecodeError, KeyError, TypeError):
+        pass
+
     with open(config_path) as f:
-        return yaml.safe_load(f)
+        config = yaml.load(f, Loader=YamlLoader)
+
+    try:
+        cache_path.write_bytes(orjson.dumps({"mtime": mtime, "config": config}))
+    except (OSError, TypeError):
+        pass  # Cache is optional (read-only dir, non-JSON YAML values)
+    return config
 
 
 def setup_logging(config: dict):
@@ -51,7 +77,13 @@ class RadioWallServer:
         self.radio = RadioGardenClient(config.get("radio_garden", {}))
         self.upnp = UpnpStreamer(config.get("upnp", {}))
         self.mqtt = MqttHandler(config.get("mqtt", {}))
+        # One long-lived event loop for all UPnP calls, driven by its own
+        # thread so the MQTT thread only submits coroutines to it
         self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(
+            target=self._loop.run_forever, name="upnp-loop", daemon=True
+        )
+        self._loop_thread.start()
 
         # State for next/replay commands
         self._candidates: list[dict] = []
@@ -63,7 +95,7 @@ class RadioWallServer:
 
         # Pre-discover UPnP speaker (non-fatal if not found)
         try:
-            self._loop.run_until_complete(self.upnp.discover())
+            self._run_async(self.upnp.discover())
         except Exception:
             logger.warning("UPnP discovery failed at startup, will retry on first touch")
 
@@ -75,6 +107,21 @@ class RadioWallServer:
         logger.info("Listening for touch events...")
         self.mqtt.start()
 
+    def shutdown(self):
+        """Stop MQTT, persist caches and stop the UPnP event loop."""
+        self.mqtt.stop()
+        self.radio.save_stream_cache()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def _run_async(self, coro, timeout: float | None = None):
+        """Run a coroutine on the UPnP event loop and wait for its result."""
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
     def _handle_touch(self, x: int, y: int):
         """Called when a touch event is received from the ESP32."""
         lat, lon = self.converter.pixel_to_latlon(x, y)
@@ -97,6 +144,12 @@ class RadioWallServer:
         """Try candidates starting from _current_index + 1 until one works."""
         start = self._current_index + 1
 
+        # Discovery has its own timeouts and can outlast UPNP_CALL_TIMEOUT,
+        # so select the renderer up front instead of inside a bounded play()
+        if not self._run_async(self.upnp.ensure_device()):
+            self.mqtt.publish_status("error", "No speaker found")
+            return
+
         for i in range(start, len(self._candidates)):
             station = self._candidates[i]
             station_name = station["station_name"]
@@ -111,9 +164,14 @@ class RadioWallServer:
 
             logger.info("Playing %s from %s, %s", station_name, location, country)
 
-            success = self._loop.run_until_complete(
-                self.upnp.play(stream_url, title=f"{station_name} - {location}")
-            )
+            try:
+                success = self._run_async(
+                    self.upnp.play(stream_url, title=f"{station_name} - {location}"),
+                    timeout=UPNP_CALL_TIMEOUT,
+                )
+            except concurrent.futures.TimeoutError:
+                logger.warning("UPnP playback timed out for %s", station_name)
+                success = False
 
             if success:
                 self._current_index = i
@@ -131,7 +189,10 @@ class RadioWallServer:
         """Called when a command is received from the ESP32."""
         if cmd == "stop":
             logger.info("Command: stop")
-            self._loop.run_until_complete(self.upnp.stop())
+            try:
+                self._run_async(self.upnp.stop(), timeout=UPNP_CALL_TIMEOUT)
+            except concurrent.futures.TimeoutError:
+                logger.warning("UPnP stop timed out")
             self.mqtt.publish_status("stopped")
 
         elif cmd == "next":
@@ -158,11 +219,13 @@ def main():
     setup_logging(config)
 
     server = RadioWallServer(config)
+    # docker stop sends SIGTERM: shut down (and persist caches) as on Ctrl+C
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
     try:
         server.start()
     except KeyboardInterrupt:
         logger.info("Shutting down")
-        server.mqtt.stop()
+        server.shutdown()
 
 
 if __name__ == "__main__":
@@ -4,14 +4,19 @@ Subscribes to touch events from the ESP32 and publishes now-playing/status updat
 Uses paho-mqtt for the MQTT client.
 """
 
-import json
 import logging
+import struct
+import threading
 from typing import Callable
 
+import orjson
 import paho.mqtt.client as mqtt
 
 logger = logging.getLogger(__name__)
 
+# Compact binary touch payload: little-endian uint16 x, uint16 y
+TOUCH_BIN_FORMAT = struct.Struct("<HH")
+
 
 class MqttHandler:
     def __init__(self, config: dict):
@@ -22,13 +27,20 @@ class MqttHandler:
 
         topics = config.get("topics", {})
         self.topic_touch = topics.get("touch", "radiowall/touch")
+        self.topic_touch_bin = topics.get("touch_bin", "radiowall/touch/bin")
         self.topic_nowplaying = topics.get("nowplaying", "radiowall/nowplaying")
         self.topic_status = topics.get("status", "radiowall/status")
         self.topic_command = topics.get("command", "radiowall/command")
 
+        # Touches within this window are coalesced; only the last one is handled
+        self.touch_debounce = config.get("touch_debounce_ms", 150) / 1000
+
+        # Persistent session: the broker keeps our subscriptions and queued
+        # QoS 1 messages across reconnects
         self._client = mqtt.Client(
-            mqtt.CallbackAPIVersion.VERSION1,
+            mqtt.CallbackAPIVersion.VERSION2,
             client_id="radiowall-server",
+            clean_session=False,
         )
         self._client.on_connect = self._on_connect
         self._client.on_message = self._on_message
@@ -36,6 +48,12 @@ class MqttHandler:
         self._on_touch: Callable[[int, int], None] | None = None
         self._on_command: Callable[[str], None] | None = None
 
+        self._pending_xy: tuple[int, int] | None = None
+        self._touch_timer: threading.Timer | None = None
+        self._touch_lock = threading.Lock()
+        # Serializes callbacks: debounced touches fire from timer threads
+        self._callback_lock = threading.Lock()
+
     def set_touch_callback(self, callback: Callable[[int, int], None]):
         """Set callback for touch events. Called with (x, y)."""
         self._on_touch = callback
@@ -64,12 +82,15 @@ class MqttHandler:
 
     def stop(self):
         """Stop the MQTT client."""
+        with self._touch_lock:
+            if self._touch_timer is not None:
+                self._touch_timer.cancel()
         self._client.loop_stop()
         self._client.disconnect()
 
     def publish_now_playing(self, station: str, location: str, country: str):
         """Publish now-playing info to the ESP32."""
-        payload = json.dumps({
+        payload = orjson.dumps({
             "station": station,
             "location": location,
             "country": country,
@@ -82,25 +103,37 @@ class MqttHandler:
         payload = {"state": state}
         if msg:
             payload["msg"] = msg
-        self._client.publish(self.topic_status, json.dumps(payload), qos=1)
+        self._client.publish(self.topic_status, orjson.dumps(payload), qos=1)
 
     # ------------------------------------------------------------------
     # Internal callbacks
     # ------------------------------------------------------------------
 
-    def _on_connect(self, client, userdata, flags, rc):
-        if rc == 0:
+    def _on_connect(self, client, userdata, flags, reason_code, properties):
+        if not reason_code.is_failure:
             logger.info("Connected to MQTT broker")
             client.subscribe(self.topic_touch, qos=1)
+            client.subscribe(self.topic_touch_bin, qos=1)
             client.subscribe(self.topic_command, qos=1)
-            logger.info("Subscribed to %s, %s", self.topic_touch, self.topic_command)
+            logger.info("Subscribed to %s, %s, %s",
+                        self.topic_touch, self.topic_touch_bin, self.topic_command)
         else:
-            logger.error("MQTT connection failed with code %d", rc)
+            logger.error("MQTT connection failed: %s", reason_code)
 
     def _on_message(self, client, userdata, msg):
+        # Fast path: binary touch, no JSON parsing
+        if msg.topic == self.topic_touch_bin:
+            if len(msg.payload) != TOUCH_BIN_FORMAT.size:
+                logger.warning("Invalid binary touch on %s: %r", msg.topic, msg.payload)
+                return
+            x, y = TOUCH_BIN_FORMAT.unpack(msg.payload)
+            logger.info("Touch event: (%d, %d)", x, y)
+            self._queue_touch(x, y)
+            return
+
         try:
-            payload = json.loads(msg.payload.decode())
-        except (json.JSONDecodeError, UnicodeDecodeError):
+            payload = orjson.loads(msg.payload)
+        except orjson.JSONDecodeError:
             logger.warning("Invalid message on %s: %s", msg.topic, msg.payload)
             return
 
@@ -109,8 +142,7 @@ class MqttHandler:
             y = payload.get("y")
             if x is not None and y is not None:
                 logger.info("Touch event: (%d, %d)", x, y)
-                if self._on_touch:
-                    self._on_touch(int(x), int(y))
+                self._queue_touch(int(x), int(y))
             else:
                 logger.warning("Touch event missing x/y: %s", payload)
 
@@ -119,4 +151,30 @@ class MqttHandler:
             if cmd:
                 logger.info("Command: %s", cmd)
                 if self._on_command:
-                    self._on_command(cmd)
+                    with self._callback_lock:
+                        self._on_command(cmd)
+
+    def _queue_touch(self, x: int, y: int):
+        """Debounce touches: restart the timer so only the last of a burst fires."""
+        if self.touch_debounce <= 0:
+            self._fire_touch((x, y))
+            return
+        with self._touch_lock:
+            self._pending_xy = (x, y)
+            if self._touch_timer is not None:
+                self._touch_timer.cancel()
+            self._touch_timer = threading.Timer(self.touch_debounce, self._flush_touch)
+            self._touch_timer.daemon = True
+            self._touch_timer.start()
+
+    def _flush_touch(self):
+        with self._touch_lock:
+            xy, self._pending_xy = self._pending_xy, None
+            self._touch_timer = None
+        if xy is not None:
+            self._fire_touch(xy)
+
+    def _fire_touch(self, xy: tuple[int, int]):
+        if self._on_touch:
+            with self._callback_lock:
+                self._on_touch(*xy)
@@ -3,13 +3,19 @@
 Fetches places, finds nearest stations to coordinates, and resolves stream URLs.
 """
 
+import json
 import logging
 import random
 import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
 
-import geopy.distance
+import numpy as np
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +25,35 @@ GEO_LAT_IDX = 1
 
 STREAM_CHECK_TIMEOUT = 5  # seconds
 
+HTTP_POOL_SIZE = 32  # keep-alive connections per host
+CHANNEL_FETCH_WORKERS = 8  # parallel /page/{id}/channels requests
+
+EARTH_RADIUS_KM = 6371.0088  # mean Earth radius
+PREFILTER_CANDIDATES = 64  # places ranked by the cheap approximation before haversine
+
+
+@dataclass(slots=True)
+class Place:
+    """The fields of a Radio.garden place that the client actually uses."""
+
+    id: str
+    title: str
+    country: str
+    size: int
+    lat: float
+    lon: float
+
+    @classmethod
+    def from_api(cls, p: dict) -> "Place":
+        return cls(
+            id=p["id"],
+            title=p.get("title", "Unknown"),
+            country=p.get("country", "Unknown"),
+            size=p.get("size", 1),
+            lat=p["geo"][GEO_LAT_IDX],
+            lon=p["geo"][GEO_LON_IDX],
+        )
+
 
 class RadioGardenClient:
     def __init__(self, config: dict):
@@ -26,11 +61,45 @@ class RadioGardenClient:
         self.cache_ttl = config.get("cache_places_seconds", 3600)
         self.n_stations = config.get("n_stations", 20)
         self.selection_mode = config.get("selection_mode", "random")
+        self.stream_cache_ttl = config.get("cache_stream_seconds", 86400)
+        cache_file = config.get("stream_cache_file")
+        # Relative paths are resolved next to the server sources (like config.yaml)
+        self.stream_cache_file = Path(__file__).parent / cache_file if cache_file else None
 
-        self._places: list[dict] = []
+        self._rng = random.Random()
+        self._places: list[Place] = []
         self._places_fetched_at: float = 0
+        # Validators of the last /places response, for conditional refreshes
+        self._places_etag: str | None = None
+        self._places_last_modified: str | None = None
+        # Place coordinates as parallel arrays (radians) for vectorized distances
+        self._lat_rad = np.empty(0, dtype=np.float64)
+        self._lon_rad = np.empty(0, dtype=np.float64)
+        self._cos_lat = np.empty(0, dtype=np.float64)
         self._session = requests.Session()
-        self._session.headers.update({"Accept": "application/json"})
+        self._session.headers.update({
+            "Accept": "application/json",
+            "Connection": "keep-alive",
+        })
+        # Plain pooled adapter for everything, including stream probes and the
+        # /listen HEAD: a dead stream must fail after one timeout, not three
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        # Radio.garden API calls retry transient 502/503/504 only
+        # (no connect/read retries, so timeouts are not multiplied)
+        api_adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_SIZE,
+            pool_maxsize=HTTP_POOL_SIZE,
+            max_retries=Retry(total=2, connect=0, read=0, status=2, backoff_factor=0.2,
+                              status_forcelist=(502, 503, 504)),
+        )
+        self._session.mount(f"{self.base_url}/", api_adapter)
+        self._session.mount(f"{self.base_url}/listen/", adapter)
+
+        # station_id -> (resolved_at, stream_url)
+        self._stream_cache: dict[str, tuple[float, str]] = {}
+        self._load_stream_cache()
 
     # ------------------------------------------------------------------
     # Places cache
@@ -40,12 +109,61 @@ class RadioGardenClient:
         if self._places and (time.time() - self._places_fetched_at) < self.cache_ttl:
             return
         logger.info("Fetching places from Radio.garden ...")
-        resp = self._session.get(f"{self.base_url}/places")
+        headers = {}
+        if self._places:
+            if self._places_etag:
+                headers["If-None-Match"] = self._places_etag
+            if self._places_last_modified:
+                headers["If-Modified-Since"] = self._places_last_modified
+        resp = self._session.get(f"{self.base_url}/places", headers=headers)
+        if resp.status_code == 304:
+            self._places_fetched_at = time.time()
+            logger.info("Places unchanged")
+            return
         resp.raise_for_status()
-        self._places = resp.json()["data"]["list"]
+        self._places = [
+            Place.from_api(p) for p in orjson.loads(resp.content)["data"]["list"]
+        ]
         self._places_fetched_at = time.time()
+        self._places_etag = resp.headers.get("ETag")
+        self._places_last_modified = resp.headers.get("Last-Modified")
+        self._build_coordinate_arrays()
         logger.info("Loaded %d places", len(self._places))
 
+    def _build_coordinate_arrays(self):
+        """Precompute place coordinates (radians) used by the distance search."""
+        self._lat_rad = np.deg2rad(np.array(
+            [p.lat for p in self._places], dtype=np.float64
+        ))
+        self._lon_rad = np.deg2rad(np.array(
+            [p.lon for p in self._places], dtype=np.float64
+        ))
+        self._cos_lat = np.cos(self._lat_rad)
+
+    def _candidate_places(self, lat: float, lon: float, k: int) -> np.ndarray:
+        """Indices of (roughly) the k nearest places.
+
+        Ranks all places with an equirectangular approximation, which needs
+        no transcendental function per place.
+        """
+        if k >= len(self._lat_rad):
+            return np.arange(len(self._lat_rad))
+        lat_r = np.deg2rad(lat)
+        dlat = self._lat_rad - lat_r
+        # Wrap longitude difference to [-pi, pi) so the dateline is handled
+        dlon = (self._lon_rad - np.deg2rad(lon) + np.pi) % (2 * np.pi) - np.pi
+        d2 = dlat * dlat + (dlon * np.cos(lat_r)) ** 2
+        return np.argpartition(d2, k)[:k]
+
+    def _place_distances(self, lat: float, lon: float, idx: np.ndarray) -> np.ndarray:
+        """Haversine distance (km) from (lat, lon) to the places at idx."""
+        lat_r = np.deg2rad(lat)
+        lon_r = np.deg2rad(lon)
+        dlat = self._lat_rad[idx] - lat_r
+        dlon = self._lon_rad[idx] - lon_r
+        a = np.sin(dlat / 2) ** 2 + self._cos_lat[idx] * np.cos(lat_r) * np.sin(dlon / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
     # ------------------------------------------------------------------
     # Find nearest stations
     # ------------------------------------------------------------------
@@ -58,60 +176,49 @@ class RadioGardenClient:
         """
         self._refresh_places_if_needed()
 
-        # Calculate distances
-        target = (lat, lon)
-        places_with_dist = []
-        for place in self._places:
-            place_lat = place["geo"][GEO_LAT_IDX]
-            place_lon = place["geo"][GEO_LON_IDX]
-            dist = geopy.distance.geodesic((place_lat, place_lon), target).km
-            places_with_dist.append({**place, "_dist": dist})
-
-        places_with_dist.sort(key=lambda p: p["_dist"])
+        # Only the closest n_stations places can ever be selected (each has
+        # size >= 1). Pre-select a wider candidate set cheaply, then order it
+        # by exact haversine distance.
+        candidates = self._candidate_places(
+            lat, lon, max(PREFILTER_CANDIDATES, self.n_stations)
+        )
+        dist = self._place_distances(lat, lon, candidates)
+        order = candidates[np.argsort(dist)]
 
         # Collect places until we have enough stations
         selected_places = []
         total_size = 0
-        for place in places_with_dist:
+        for i in order:
             if total_size >= self.n_stations:
                 break
+            place = self._places[i]
             selected_places.append(place)
-            total_size += place.get("size", 1)
+            total_size += place.size
 
         if not selected_places:
             raise RuntimeError(f"No radio places found near ({lat}, {lon})")
 
-        # Fetch channels from selected places, remembering which place each came from
+        # Fetch channels from all selected places concurrently (I/O bound),
+        # then assemble them in distance order
+        with ThreadPoolExecutor(max_workers=CHANNEL_FETCH_WORKERS) as executor:
+            place_items = list(executor.map(self._fetch_place_channels, selected_places))
+
         channels = []  # list of (channel, place) tuples
-        for place in selected_places:
-            try:
-                resp = self._session.get(
-                    f"{self.base_url}/page/{place['id']}/channels"
-                )
-                resp.raise_for_status()
-                data = resp.json()
-                items = data["data"]["content"][0]["items"]
-
-                remaining = self.n_stations - len(channels)
-                if place is selected_places[-1] and len(items) > remaining:
-                    channels.extend((ch, place) for ch in random.sample(items, remaining))
-                else:
-                    channels.extend((ch, place) for ch in items)
-            except Exception:
-                logger.warning("Failed to fetch channels for %s", place.get("title"))
-                continue
+        for place, items in zip(selected_places, place_items):
+            channels.extend((ch, place) for ch in items)
 
         if not channels:
             raise RuntimeError(f"No channels found near ({lat}, {lon})")
 
-        # Order channels based on selection mode
+        # Keep the nearest n_stations (distance order), then order them
+        # based on selection mode
+        channels = channels[:self.n_stations]
         if self.selection_mode == "nearest":
             pass  # already ordered by distance
         elif self.selection_mode == "popular":
             pass  # keep API order (roughly by popularity)
         else:
-            random.seed(str(datetime.now()))
-            random.shuffle(channels)
+            self._rng.shuffle(channels)
 
         # Build result list
         results = []
@@ -121,11 +228,60 @@ class RadioGardenClient:
             results.append({
                 "station_name": page["title"],
                 "station_id": station_id,
-                "location": place.get("title", "Unknown"),
-                "country": place.get("country", "Unknown"),
+                "location": place.title,
+                "country": place.country,
             })
         return results
 
+    def _fetch_place_channels(self, place: Place) -> list[dict]:
+        """Fetch the channel list of a place. Returns [] on failure."""
+        try:
+            resp = self._session.get(
+                f"{self.base_url}/page/{place.id}/channels", timeout=5
+            )
+            resp.raise_for_status()
+            data = orjson.loads(resp.content)
+            return data["data"]["content"][0]["items"]
+        except Exception:
+            logger.warning("Failed to fetch channels for %s", place.title)
+            return []
+
+    # ------------------------------------------------------------------
+    # Stream URL cache
+    # ------------------------------------------------------------------
+
+    def _load_stream_cache(self):
+        if self.stream_cache_file is None or not self.stream_cache_file.exists():
+            return
+        try:
+            with open(self.stream_cache_file) as f:
+                entries = json.load(f)
+            self._stream_cache = {
+                station_id: (float(resolved_at), url)
+                for station_id, (resolved_at, url) in entries.items()
+            }
+            logger.info("Loaded %d cached stream URLs", len(self._stream_cache))
+        except Exception:
+            logger.warning("Could not read stream cache %s", self.stream_cache_file)
+
+    def save_stream_cache(self):
+        """Persist resolved stream URLs so they survive a restart."""
+        if self.stream_cache_file is None:
+            return
+        now = time.time()
+        entries = {
+            station_id: [resolved_at, url]
+            for station_id, (resolved_at, url) in self._stream_cache.items()
+            if now - resolved_at < self.stream_cache_ttl
+        }
+        try:
+            self.stream_cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.stream_cache_file, "w") as f:
+                json.dump(entries, f)
+            logger.info("Saved %d cached stream URLs", len(entries))
+        except OSError:
+            logger.warning("Could not write stream cache %s", self.stream_cache_file)
+
     # ------------------------------------------------------------------
     # Stream URL resolution & validation
     # ------------------------------------------------------------------
@@ -137,12 +293,21 @@ class RadioGardenClient:
         Some streams have broken SSL certs, so we fall back to the redirect
         Location header or the Radio.garden URL itself (the UPnP speaker
         will follow the redirect on its own).
+
+        Redirect targets are cached per station for cache_stream_seconds;
+        fallbacks are not cached, so a later call retries the resolution.
         """
+        cached = self._stream_cache.get(station_id)
+        if cached and (time.time() - cached[0]) < self.stream_cache_ttl:
+            return cached[1]
+
         url = f"{self.base_url}/listen/{station_id}/channel.mp3"
         try:
             resp = self._session.head(url, allow_redirects=False, timeout=10)
-            if resp.status_code in (301, 302, 307, 308):
-                return resp.headers.get("Location", url)
+            location = resp.headers.get("Location")
+            if resp.status_code in (301, 302, 307, 308) and location:
+                self._stream_cache[station_id] = (time.time(), location)
+                return location
             return resp.url
         except Exception:
             logger.warning("Could not resolve stream URL for %s, using direct URL", station_id)
@@ -151,7 +316,8 @@ class RadioGardenClient:
     def check_stream(self, stream_url: str) -> bool:
         """Check if a stream URL is alive by reading the first chunk.
 
-        Returns True if the stream responds with audio data.
+        Returns True if the stream responds with audio data. A dead URL is
+        dropped from the stream cache so the station is resolved afresh next time.
         """
         try:
             resp = self._session.get(
@@ -160,8 +326,15 @@ class RadioGardenClient:
             # Read a small chunk to confirm data is flowing
             chunk = next(resp.iter_content(1024), None)
             resp.close()
-            if resp.status_code >= 400:
-                return False
-            return chunk is not None and len(chunk) > 0
+            alive = resp.status_code < 400 and chunk is not None and len(chunk) > 0
         except Exception:
-            return False
+            alive = False
+        if not alive:
+            self._forget_stream_url(stream_url)
+        return alive
+
+    def _forget_stream_url(self, stream_url: str):
+        """Evict every cached station that resolved to stream_url."""
+        stale = [sid for sid, (_, url) in self._stream_cache.items() if url == stream_url]
+        for station_id in stale:
+            del self._stream_cache[station_id]
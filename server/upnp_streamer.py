@@ -1,16 +1,21 @@
 """UPnP/DLNA streamer for sending audio to network speakers (e.g. WiiM Amp Pro)."""
 
 import asyncio
+import json
 import logging
+from pathlib import Path
 
 from async_upnp_client.aiohttp import AiohttpRequester
-from async_upnp_client.client import UpnpDevice
+from async_upnp_client.client import UpnpAction, UpnpDevice
 from async_upnp_client.client_factory import UpnpFactory
-from async_upnp_client.search import async_search
+from async_upnp_client.search import SsdpSearchListener
 from async_upnp_client.utils import CaseInsensitiveDict
 
 logger = logging.getLogger(__name__)
 
+AV_TRANSPORT_SERVICE = "urn:schemas-upnp-org:service:AVTransport:1"
+RENDERING_CONTROL_SERVICE = "urn:schemas-upnp-org:service:RenderingControl:1"
+
 DIDL_TEMPLATE = """<DIDL-Lite xmlns="urn:schemas-upnp-org:metadata-1-0/DIDL-Lite/"
     xmlns:dc="http://purl.org/dc/elements/1.1/"
     xmlns:upnp="urn:schemas-upnp-org:metadata-1-0/upnp/">
@@ -21,114 +26,245 @@ DIDL_TEMPLATE = """<DIDL-Lite xmlns="urn:schemas-upnp-org:metadata-1-0/DIDL-Lite
   </item>
 </DIDL-Lite>"""
 
+# Single-pass XML escape for DIDL-Lite text content
+_XML_ESCAPE = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&apos;",
+})
+
 
 class UpnpStreamer:
     def __init__(self, config: dict):
         self.device_name = config.get("device_name")
         self.discovery_timeout = config.get("discovery_timeout", 5)
         self.default_volume = config.get("default_volume")
+        cache_file = config.get("device_cache_file", "cache/device.json")
+        # Relative paths are resolved next to the server sources (like config.yaml)
+        self.device_cache_file = Path(__file__).parent / cache_file if cache_file else None
         self._device: UpnpDevice | None = None
         self._requester = AiohttpRequester()
 
+        # Actions of the selected renderer, resolved once in _select_device()
+        self._act_stop: UpnpAction | None = None
+        self._act_set_uri: UpnpAction | None = None
+        self._act_play: UpnpAction | None = None
+        self._act_set_vol: UpnpAction | None = None
+
     async def discover(self) -> str | None:
         """Discover UPnP media renderers on the network.
 
+        Tries the renderer remembered from the last run first and only falls
+        back to an SSDP search if it is unreachable or no longer matches.
+
         Returns the friendly name of the selected device, or None if not found.
         """
+        cached_location = self._load_cached_location()
+        if cached_location:
+            name = await self._try_location(cached_location)
+            if name is not None:
+                return name
+            logger.info("Cached renderer at %s unavailable, scanning", cached_location)
+
         logger.info("Scanning for UPnP devices (timeout=%ds)...", self.discovery_timeout)
 
-        # Collect SSDP responses via callback
-        locations: list[str] = []
+        # Probe each responding device as soon as its SSDP response arrives
+        # and stop searching once a matching renderer has been selected
+        seen: set[str] = set()
+        probes: set[asyncio.Task] = set()
+        found = asyncio.Event()
+        selected: list[str] = []
+
+        async def _probe(location: str) -> None:
+            result = await self._probe_location(location)
+            if result is not None and not found.is_set():
+                device, name = result
+                if self._use_device(device, location):
+                    selected.append(name)
+                    found.set()
 
         async def _on_response(headers: CaseInsensitiveDict) -> None:
             location = headers.get("location")
-            if location and location not in locations:
-                locations.append(location)
+            if listening and location and location not in seen:
+                seen.add(location)
+                probes.add(asyncio.create_task(_probe(location)))
 
-        await async_search(_on_response, timeout=self.discovery_timeout)
+        async def _on_connected() -> None:
+            listener.async_search()
 
-        for location in locations:
+        # Drive the listener directly (async_search() leaks its socket when
+        # cancelled) so it is always closed, even on an early match
+        listener = SsdpSearchListener(
+            async_callback=_on_response,
+            timeout=self.discovery_timeout,
+            async_connect_callback=_on_connected,
+        )
+        listening = True
+        found_wait = asyncio.create_task(found.wait())
+        probes_done = None
+        try:
             try:
-                factory = UpnpFactory(self._requester)
-                device = await factory.async_create_device(location)
+                await listener.async_start()
+                await asyncio.wait({found_wait}, timeout=self.discovery_timeout)
+            except OSError:
+                logger.warning("SSDP search failed", exc_info=True)
+            finally:
+                listening = False
+                listener.async_stop()
 
-                # Check if it's a media renderer
-                av_transport = device.service(
-                    "urn:schemas-upnp-org:service:AVTransport:1"
+            # Search finished without a match yet: let in-flight probes complete
+            if not found.is_set() and probes:
+                probes_done = asyncio.create_task(asyncio.wait(set(probes)))
+                await asyncio.wait(
+                    {found_wait, probes_done},
+                    timeout=self.discovery_timeout,
+                    return_when=asyncio.FIRST_COMPLETED,
                 )
-                if av_transport is None:
-                    continue
+        finally:
+            for task in (found_wait, probes_done, *probes):
+                if task is not None:
+                    task.cancel()
 
-                name = device.friendly_name
-                logger.info("Found renderer: %s", name)
+        if selected:
+            return selected[0]
 
-                if self.device_name is None or self.device_name.lower() in name.lower():
-                    self._device = device
-                    logger.info("Selected renderer: %s", name)
-                    return name
+        logger.warning("No suitable UPnP renderer found")
+        return None
 
-            except Exception:
-                logger.debug("Failed to query device at %s", location)
-                continue
+    async def ensure_device(self) -> bool:
+        """Run discovery if no renderer is selected yet.
+
+        Returns True if a renderer is available.
+        """
+        if self._device is None and await self.discover() is None:
+            logger.error("No UPnP device available")
+            return False
+        return True
+
+    async def _try_location(self, location: str) -> str | None:
+        """Select the renderer at location if it matches device_name.
+
+        Returns its friendly name, or None if it is unreachable, not a media
+        renderer, or a different device.
+        """
+        result = await self._probe_location(location)
+        if result is None:
+            return None
+        device, name = result
+        return name if self._use_device(device, location) else None
+
+    async def _probe_location(self, location: str) -> tuple[UpnpDevice, str] | None:
+        """Fetch the device at location and check it is the wanted renderer."""
+        try:
+            factory = UpnpFactory(self._requester)
+            device = await factory.async_create_device(location)
+
+            # Check if it's a media renderer
+            av_transport = device.service(AV_TRANSPORT_SERVICE)
+            if av_transport is None:
+                return None
+
+            name = device.friendly_name
+            logger.info("Found renderer: %s", name)
+
+            if self.device_name is None or self.device_name.lower() in name.lower():
+                return device, name
+
+        except Exception:
+            logger.debug("Failed to query device at %s", location)
 
-        logger.warning("No suitable UPnP renderer found")
         return None
 
+    def _use_device(self, device: UpnpDevice, location: str) -> bool:
+        """Select device and remember its location. Returns False if unusable."""
+        try:
+            self._select_device(device)
+        except Exception:
+            logger.debug("Renderer at %s lacks required actions", location)
+            return False
+        logger.info("Selected renderer: %s", device.friendly_name)
+        self._save_cached_location(location, device.friendly_name)
+        return True
+
+    def _load_cached_location(self) -> str | None:
+        if self.device_cache_file is None or not self.device_cache_file.exists():
+            return None
+        try:
+            with open(self.device_cache_file) as f:
+                return json.load(f).get("location")
+        except Exception:
+            logger.debug("Could not read device cache %s", self.device_cache_file)
+            return None
+
+    def _save_cached_location(self, location: str, name: str):
+        if self.device_cache_file is None:
+            return
+        try:
+            self.device_cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.device_cache_file, "w") as f:
+                json.dump({"location": location, "friendly_name": name}, f)
+        except OSError:
+            logger.warning("Could not write device cache %s", self.device_cache_file)
+
+    def _select_device(self, device: UpnpDevice):
+        """Use device as the renderer and cache the actions play/stop need."""
+        av_transport = device.service(AV_TRANSPORT_SERVICE)
+        act_stop = av_transport.action("Stop")
+        act_set_uri = av_transport.action("SetAVTransportURI")
+        act_play = av_transport.action("Play")
+
+        act_set_vol = None
+        if device.has_service(RENDERING_CONTROL_SERVICE):
+            rc = device.service(RENDERING_CONTROL_SERVICE)
+            if rc.has_action("SetVolume"):
+                act_set_vol = rc.action("SetVolume")
+
+        self._act_stop = act_stop
+        self._act_set_uri = act_set_uri
+        self._act_play = act_play
+        self._act_set_vol = act_set_vol
+        self._device = device
+
     async def play(self, stream_url: str, title: str = "RadioWall") -> bool:
         """Send a stream URL to the UPnP renderer for playback.
 
         Returns True on success.
         """
-        if self._device is None:
-            if await self.discover() is None:
-                logger.error("No UPnP device available")
-                return False
-
-        av_transport = self._device.service(
-            "urn:schemas-upnp-org:service:AVTransport:1"
-        )
-        if av_transport is None:
-            logger.error("Device has no AVTransport service")
+        if not await self.ensure_device():
             return False
 
         try:
             # Stop current playback
-            stop_action = av_transport.action("Stop")
-            await stop_action.async_call(InstanceID=0)
+            await self._act_stop.async_call(InstanceID=0)
         except Exception:
             pass  # May fail if nothing is playing
 
         # Set volume if configured
-        if self.default_volume is not None:
+        if self.default_volume is not None and self._act_set_vol is not None:
             try:
-                rc = self._device.service(
-                    "urn:schemas-upnp-org:service:RenderingControl:1"
+                await self._act_set_vol.async_call(
+                    InstanceID=0,
+                    Channel="Master",
+                    DesiredVolume=self.default_volume,
                 )
-                if rc:
-                    set_vol = rc.action("SetVolume")
-                    await set_vol.async_call(
-                        InstanceID=0,
-                        Channel="Master",
-                        DesiredVolume=self.default_volume,
-                    )
             except Exception:
                 logger.warning("Failed to set volume")
 
         # Build DIDL-Lite metadata
-        safe_title = title.replace("&", "&amp;").replace("<", "&lt;")
-        safe_url = stream_url.replace("&", "&amp;")
-        metadata = DIDL_TEMPLATE.format(title=safe_title, url=safe_url)
+        metadata = DIDL_TEMPLATE.format(
+            title=title.translate(_XML_ESCAPE),
+            url=stream_url.translate(_XML_ESCAPE),
+        )
 
         try:
-            set_uri = av_transport.action("SetAVTransportURI")
-            await set_uri.async_call(
+            await self._act_set_uri.async_call(
                 InstanceID=0,
                 CurrentURI=stream_url,
                 CurrentURIMetaData=metadata,
             )
-
-            play_action = av_transport.action("Play")
-            await play_action.async_call(InstanceID=0, Speed="1")
+            await self._act_play.async_call(InstanceID=0, Speed="1")
 
             logger.info("Playing: %s -> %s", title, stream_url)
             return True
@@ -142,15 +278,8 @@ class UpnpStreamer:
         if self._device is None:
             return True
 
-        av_transport = self._device.service(
-            "urn:schemas-upnp-org:service:AVTransport:1"
-        )
-        if av_transport is None:
-            return False
-
         try:
-            stop_action = av_transport.action("Stop")
-            await stop_action.async_call(InstanceID=0)
+            await self._act_stop.async_call(InstanceID=0)
             logger.info("Playback stopped")
             return True
         except Exception:
@@ -22,23 +22,36 @@ Usage:
     python generate_map_bitmaps.py
 
 Requirements:
-    pip install geopandas matplotlib numpy Pillow requests
+    pip install geopandas pyogrio matplotlib numpy Pillow requests
+    pip install pyarrow   (optional, caches shapefiles as GeoParquet)
+    pip install rasterio   (optional, much faster rendering)
 """
 
-import io
 import os
+import shutil
 import struct
 import sys
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 import geopandas as gpd
 import matplotlib.pyplot as plt
 import numpy as np
 import requests
+import shapely
+from matplotlib.collections import LineCollection, PathCollection
+from matplotlib.path import Path as MplPath
 from PIL import Image
 
+try:
+    # Optional: burns geometries straight into arrays, skipping matplotlib
+    from rasterio.features import rasterize
+    from rasterio.transform import from_bounds
+except ImportError:
+    rasterize = None
+
 
 # Map dimensions (portrait: 180 wide x 580 tall - fills display above status bar)
 MAP_WIDTH = 180
@@ -66,12 +79,36 @@ NE_BORDERS_50M_URL = "https://naciscdn.org/naturalearth/50m/cultural/ne_50m_admi
 # Zoom levels that use 50m data (higher detail)
 HIGH_RES_ZOOM_THRESHOLD = 4
 
+# Geometry simplification tolerance as a fraction of the finest pixel pitch
+# of the zooms that use each dataset (see simplify_tolerance): 1/8 px keeps
+# the simplification invisible, e.g. ~0.008deg for 50m at 5x
+# (180deg / 2900 px = 0.062deg per pixel vertically)
+SIMPLIFY_PIXEL_FRACTION = 0.125
+
+# Extra margin (degrees) when selecting geometries for a region, so border
+# lines just outside the bounds still draw their edge pixels
+CLIP_MARGIN = 0.5
+
 # Output paths
 SCRIPT_DIR = Path(__file__).parent
 DATA_DIR = SCRIPT_DIR / "data"
 OUTPUT_HEADER = SCRIPT_DIR.parent / "esp32" / "src" / "world_map_data.h"
 OUTPUT_MAPS_DIR = SCRIPT_DIR.parent / "esp32" / "data" / "maps"
 
+# Matplotlib rendering (fallback when rasterio is not installed)
+RENDER_DPI = 100
+
+# Grayscale -> 3-color lookup for rendered pixels
+GRAY_TO_COLOR = np.zeros(256, dtype=np.uint8)  # <= 60: black = ocean (0)
+GRAY_TO_COLOR[61:201] = 2                      # gray = border
+GRAY_TO_COLOR[201:] = 1                        # bright white = land
+
+# Figures are reused across renders, one per pixel size
+_FIGURE_CACHE: Dict[Tuple[int, int], Tuple[plt.Figure, plt.Axes]] = {}
+
+# Geometries loaded once per render worker process: resolution -> (countries, borders)
+_WORKER_GEOMETRIES: Dict[str, Tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]] = {}
+
 
 def download_and_extract(url: str, name: str) -> Path:
     """Download and extract a Natural Earth shapefile."""
@@ -89,12 +126,11 @@ def download_and_extract(url: str, name: str) -> Path:
     print(f"  Downloading {name}...")
     zip_path = DATA_DIR / zip_name
 
-    response = requests.get(url, stream=True)
-    response.raise_for_status()
-
-    with open(zip_path, "wb") as f:
-        for chunk in response.iter_content(chunk_size=8192):
-            f.write(chunk)
+    with requests.get(url, stream=True) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True
+        with open(zip_path, "wb") as f:
+            shutil.copyfileobj(response.raw, f, length=1 << 20)
 
     print(f"  [OK] Downloaded {zip_path.stat().st_size / 1024:.1f} KB")
 
@@ -105,9 +141,151 @@ def download_and_extract(url: str, name: str) -> Path:
     return shapefile_path
 
 
+def read_shapefile(shapefile_path: Path) -> gpd.GeoDataFrame:
+    """
+    Read a shapefile through pyogrio, caching it as GeoParquet alongside.
+
+    The parquet copy is reused while it is newer than the shapefile; writing
+    it needs pyarrow and is skipped if that is not installed.
+    """
+    parquet_path = shapefile_path.with_suffix(".parquet")
+    if (parquet_path.exists()
+            and parquet_path.stat().st_mtime >= shapefile_path.stat().st_mtime):
+        return gpd.read_parquet(parquet_path)
+
+    gdf = gpd.read_file(shapefile_path, engine="pyogrio")
+    try:
+        tmp_path = parquet_path.with_suffix(".parquet.tmp")
+        gdf.to_parquet(tmp_path)
+        os.replace(tmp_path, parquet_path)
+    except ImportError:
+        pass
+    return gdf
+
+
+def simplify_tolerance(res: str) -> float:
+    """Simplification tolerance (degrees) for a dataset, from its finest pixel pitch."""
+    max_zoom = max(zoom for zoom in [1] + ZOOM_LEVELS
+                   if ("50m" if zoom >= HIGH_RES_ZOOM_THRESHOLD else "110m") == res)
+    min_lon_span = min((s["lon_max"] - s["lon_min"]) % 360.0 for s in LONGITUDE_SLICES)
+    pitch = min(180.0 / (MAP_HEIGHT * max_zoom), min_lon_span / (MAP_WIDTH * max_zoom))
+    return pitch * SIMPLIFY_PIXEL_FRACTION
+
+
+def load_geometries(paths: Dict[str, Tuple[Path, Path]]
+                    ) -> Dict[str, Tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]]:
+    """Read and simplify (countries, borders) shapefiles for each resolution."""
+    geometries = {}
+    for res, (countries_path, borders_path) in paths.items():
+        countries = read_shapefile(countries_path)
+        borders = read_shapefile(borders_path)
+        tolerance = simplify_tolerance(res)
+        for gdf in (countries, borders):
+            gdf.geometry = gdf.geometry.simplify(tolerance)
+        geometries[res] = (countries, borders)
+    return geometries
+
+
+def polygon_path(geom) -> MplPath:
+    """Build one compound matplotlib path (exteriors + holes) for a (Multi)Polygon."""
+    rings = []
+    for part in shapely.get_parts(geom):
+        rings.append(MplPath(np.asarray(part.exterior.coords)[:, :2], closed=True))
+        rings.extend(MplPath(np.asarray(ring.coords)[:, :2], closed=True)
+                     for ring in part.interiors)
+    return MplPath.make_compound_path(*rings)
+
+
+def attach_artist_data(countries: gpd.GeoDataFrame, borders: gpd.GeoDataFrame):
+    """
+    Pre-build matplotlib paths / line segments for every geometry.
+
+    Stored as columns so they survive clip_to_region; the matplotlib fallback
+    then adds them as collections instead of re-converting via GeoDataFrame.plot.
+    """
+    countries["mpl_path"] = [polygon_path(geom) for geom in countries.geometry.values]
+    borders["mpl_segments"] = [[np.asarray(line.coords)[:, :2] for line in shapely.get_parts(geom)]
+                               for geom in borders.geometry.values]
+
+
+def init_render_worker(paths: Dict[str, Tuple[Path, Path]]):
+    """Process pool initializer: load geometries once instead of pickling them per task."""
+    _WORKER_GEOMETRIES.update(load_geometries(paths))
+    if rasterize is None:
+        for countries, borders in _WORKER_GEOMETRIES.values():
+            attach_artist_data(countries, borders)
+
+
+def render_and_encode(item: Tuple[int, int]) -> Tuple[Tuple[int, int], List[List[np.ndarray]]]:
+    """
+    Render one slice at one zoom level and RLE-encode its sub-maps (worker task).
+
+    Args:
+        item: (slice index, zoom); zoom 1 is the base map
+
+    Returns:
+        (item, rle) where rle[col][row] is the RLE of that sub-map
+    """
+    slice_idx, zoom = item
+    res = "50m" if zoom >= HIGH_RES_ZOOM_THRESHOLD else "110m"
+    countries, borders = _WORKER_GEOMETRIES[res]
+
+    slice_def = LONGITUDE_SLICES[slice_idx]
+    big = render_slice_highres(countries, borders, slice_def, zoom)
+
+    rle = []
+    for col in range(zoom):
+        col_rle = []
+        for row in range(zoom):
+            _, (x0, y0, x1, y1) = get_sub_bounds(slice_def, zoom, col, row)
+            col_rle.append(rle_compress(big[y0:y1, x0:x1]))
+        rle.append(col_rle)
+    return item, rle
+
+
+def clip_to_region(gdf: gpd.GeoDataFrame,
+                   lon_min: float, lon_max: float,
+                   lat_min: float, lat_max: float) -> gpd.GeoDataFrame:
+    """
+    Keep only geometries that intersect the region grown by CLIP_MARGIN.
+
+    GeoDataFrame.cx is an exact intersects() test against the box (not a
+    bounding-box overlap), so the margin is what keeps lines ending just
+    outside the region.
+    """
+    lat_lo, lat_hi = lat_min - CLIP_MARGIN, lat_max + CLIP_MARGIN
+    if lon_max < lon_min:
+        # Wrapping case: union of the windows on either side of the dateline
+        west = gdf.cx[lon_min - CLIP_MARGIN:180, lat_lo:lat_hi]
+        east = gdf.cx[-180:lon_max + CLIP_MARGIN, lat_lo:lat_hi]
+        return gdf.loc[west.index.union(east.index)]
+    return gdf.cx[lon_min - CLIP_MARGIN:lon_max + CLIP_MARGIN, lat_lo:lat_hi]
+
+
+def resize_gray(pixels: np.ndarray, width: int, height: int) -> np.ndarray:
+    """Resample a grayscale array to (height x width)."""
+    return np.array(Image.fromarray(pixels).resize((width, height), Image.Resampling.LANCZOS))
+
+
+def get_axes(width_px: int, height_px: int) -> Tuple[plt.Figure, plt.Axes]:
+    """Return a cleared, cached figure + full-size axes of the given pixel size."""
+    key = (width_px, height_px)
+    if key not in _FIGURE_CACHE:
+        fig = plt.figure(figsize=(width_px / RENDER_DPI, height_px / RENDER_DPI), dpi=RENDER_DPI,
+                         facecolor="black")
+        _FIGURE_CACHE[key] = (fig, fig.add_axes([0, 0, 1, 1]))
+
+    fig, ax = _FIGURE_CACHE[key]
+    ax.clear()
+    ax.axis("off")
+    ax.set_facecolor("black")
+    return fig, ax
+
+
 def render_region(countries: gpd.GeoDataFrame, borders: gpd.GeoDataFrame,
                   lon_min: float, lon_max: float,
-                  lat_min: float, lat_max: float) -> np.ndarray:
+                  lat_min: float, lat_max: float,
+                  width: int = MAP_WIDTH, height: int = MAP_HEIGHT) -> np.ndarray:
     """
     Render a geographic region to a 3-color bitmap.
 
@@ -121,87 +299,138 @@ def render_region(countries: gpd.GeoDataFrame, borders: gpd.GeoDataFrame,
         borders: Border line GeoDataFrame
         lon_min, lon_max: Longitude bounds
         lat_min, lat_max: Latitude bounds
+        width, height: Output size in pixels
 
     Returns:
-        numpy array (MAP_HEIGHT x MAP_WIDTH) with values 0, 1, or 2
+        numpy array (height x width) with values 0, 1, or 2
     """
-    dpi = 100
+    countries = clip_to_region(countries, lon_min, lon_max, lat_min, lat_max)
+    borders = clip_to_region(borders, lon_min, lon_max, lat_min, lat_max)
+
+    if rasterize is not None:
+        return rasterize_region(countries, borders, lon_min, lon_max, lat_min, lat_max,
+                                width, height)
 
     def render_half(lmin, lmax, width_px):
-        """Render a longitude range to a grayscale image."""
-        fig = plt.figure(figsize=(width_px / dpi, MAP_HEIGHT / dpi), dpi=dpi)
-        ax = fig.add_axes([0, 0, 1, 1])
+        """Render a longitude range to a grayscale array (height x width_px)."""
+        fig, ax = get_axes(width_px, height)
         ax.set_xlim(lmin, lmax)
         ax.set_ylim(lat_min, lat_max)
-        ax.axis("off")
-        ax.set_facecolor("black")
 
         # Layer 1: Fill country polygons white (land)
-        countries.plot(ax=ax, facecolor="white", edgecolor="none", linewidth=0)
+        if not countries.empty:
+            ax.add_collection(PathCollection(countries["mpl_path"].tolist(), facecolor="white",
+                                             edgecolor="none", linewidth=0))
 
         # Layer 2: Draw country borders as gray
-        borders.plot(ax=ax, color="#A0A0A0", linewidth=0.8)
+        if not borders.empty:
+            segments = [seg for segs in borders["mpl_segments"] for seg in segs]
+            ax.add_collection(LineCollection(segments, color="#A0A0A0", linewidth=0.8))
 
-        buf = io.BytesIO()
-        plt.savefig(buf, format="png", dpi=dpi, bbox_inches="tight", pad_inches=0,
-                    facecolor="black")
-        plt.close(fig)
-        buf.seek(0)
-        return Image.open(buf).convert("L").resize((width_px, MAP_HEIGHT), Image.Resampling.LANCZOS)
+        # Read pixels straight from the Agg canvas (no PNG encode/decode).
+        # Everything drawn is black/white/gray, so one channel is the luminance.
+        fig.canvas.draw()
+        return np.asarray(fig.canvas.buffer_rgba())[:, :, 0].copy()
 
     if lon_max < lon_min:
-        # Wrapping case (e.g. Pacific: 150deg to -150deg across dateline)
+        # Wrapping case (e.g. Pacific: 150deg to -150deg across dateline):
+        # render the whole world once at the target scale and cut out the
+        # two windows on either side of the dateline
         total_span = (lon_max + 360.0) - lon_min
-        left_span = 180.0 - lon_min
-        right_span = lon_max + 180.0
+        world = render_half(-180, 180, int(round(width * 360.0 / total_span)))
 
-        left_px = max(1, int(round(MAP_WIDTH * left_span / total_span)))
-        right_px = MAP_WIDTH - left_px
+        px_per_deg = world.shape[1] / 360.0
+        left = world[:, int(round((lon_min + 180.0) * px_per_deg)):]
+        right = world[:, :int(round((lon_max + 180.0) * px_per_deg))]
+        pixels = np.concatenate([left, right], axis=1)
+    else:
+        pixels = render_half(lon_min, lon_max, width)
 
-        img_l = render_half(lon_min, 180, left_px)
-        img_r = render_half(-180, lon_max, right_px)
+    # Figures are created at the target size, so this only guards against
+    # a canvas/dateline-slice rounding mismatch
+    if pixels.shape != (height, width):
+        pixels = resize_gray(pixels, width, height)
 
-        img = Image.new("L", (MAP_WIDTH, MAP_HEIGHT), 0)
-        img.paste(img_l, (0, 0))
-        img.paste(img_r, (left_px, 0))
-    else:
-        img = render_half(lon_min, lon_max, MAP_WIDTH)
+    # Convert to 3-color: ocean=0, land=1, border=2 (single table lookup)
+    return GRAY_TO_COLOR[pixels]
 
-    # Convert to 3-color: ocean=0, land=1, border=2
-    pixels = np.array(img)
 
-    result = np.zeros_like(pixels, dtype=np.uint8)
-    result[pixels > 200] = 1   # Bright white = land
-    result[(pixels > 60) & (pixels <= 200)] = 2  # Gray = border
-    # pixels <= 60 stays 0 = ocean (black)
+def rasterize_region(countries: gpd.GeoDataFrame, borders: gpd.GeoDataFrame,
+                     lon_min: float, lon_max: float,
+                     lat_min: float, lat_max: float,
+                     width: int = MAP_WIDTH, height: int = MAP_HEIGHT) -> np.ndarray:
+    """
+    Rasterize a geographic region to a 3-color bitmap with rasterio.
+
+    Same output as the matplotlib pipeline in render_region, but the
+    geometries are burned directly into uint8 arrays: land polygons by pixel
+    center, border lines into every pixel they touch.
+    """
+    land_shapes = [(g, 1) for g in countries.geometry if g is not None and not g.is_empty]
+    border_shapes = [(g, 2) for g in borders.geometry if g is not None and not g.is_empty]
+
+    def burn(lmin, lmax, width_px):
+        shape = (height, width_px)
+        result = np.zeros(shape, dtype=np.uint8)
+        if width_px <= 0 or lmax <= lmin:
+            return result
+        transform = from_bounds(lmin, lat_min, lmax, lat_max, width_px, height)
+        if land_shapes:
+            rasterize(land_shapes, out=result, transform=transform)
+        if border_shapes:
+            border = rasterize(border_shapes, out_shape=shape, transform=transform,
+                               fill=0, all_touched=True, dtype="uint8")
+            result[border != 0] = 2
+        return result
+
+    if lon_max < lon_min:
+        # Wrapping case (e.g. Pacific: 150deg to -150deg across dateline)
+        total_span = (lon_max + 360.0) - lon_min
+        left_px = int(round(width * (180.0 - lon_min) / total_span))
+        return np.concatenate([burn(lon_min, 180.0, left_px),
+                               burn(-180.0, lon_max, width - left_px)], axis=1)
 
-    return result
+    return burn(lon_min, lon_max, width)
 
 
-def rle_compress(bitmap: np.ndarray) -> List[Tuple[int, int]]:
+def render_slice_highres(countries: gpd.GeoDataFrame, borders: gpd.GeoDataFrame,
+                         slice_def: dict, zoom: int) -> np.ndarray:
     """
-    Run-Length Encode a bitmap with values 0, 1, or 2.
+    Render a whole longitude slice at zoom x resolution in one pass.
+
+    Zoom sub-maps are exact (MAP_HEIGHT x MAP_WIDTH) crops of the result,
+    at the pixel bounds returned by get_sub_bounds.
 
     Returns:
-        List of (count, color) tuples, ending with (0, 0) marker
+        numpy array (MAP_HEIGHT*zoom x MAP_WIDTH*zoom) with values 0, 1, or 2
     """
-    flat = bitmap.flatten()
+    return render_region(countries, borders,
+                         slice_def["lon_min"], slice_def["lon_max"], -90.0, 90.0,
+                         width=MAP_WIDTH * zoom, height=MAP_HEIGHT * zoom)
 
-    rle = []
-    current_color = int(flat[0])
-    count = 1
 
-    for pixel in flat[1:]:
-        pixel = int(pixel)
-        if pixel == current_color and count < 255:
-            count += 1
-        else:
-            rle.append((count, current_color))
-            current_color = pixel
-            count = 1
+def rle_compress(bitmap: np.ndarray) -> np.ndarray:
+    """
+    Run-Length Encode a bitmap with values 0, 1, or 2.
 
-    rle.append((count, current_color))
-    rle.append((0, 0))  # End marker
+    Returns:
+        uint8 array (N x 2) of [count, color] rows, ending with a [0, 0] marker.
+        Its raw bytes (tobytes()) are the on-device RLE format.
+    """
+    flat = bitmap.ravel()  # view for C-contiguous input; only read below
+
+    # Run boundaries: index of the last pixel of each run
+    run_ends = np.append(np.flatnonzero(flat[1:] != flat[:-1]), flat.size - 1)
+    run_lengths = np.diff(run_ends, prepend=-1)
+    run_colors = flat[run_ends]
+
+    # Split runs longer than 255 into full 255-pixel chunks plus a remainder
+    chunks = (run_lengths + 254) // 255
+    n_runs = int(chunks.sum())
+    rle = np.zeros((n_runs + 1, 2), dtype=np.uint8)  # last row stays [0, 0] = end marker
+    rle[:n_runs, 0] = 255
+    rle[np.cumsum(chunks) - 1, 0] = run_lengths - (chunks - 1) * 255
+    rle[:n_runs, 1] = np.repeat(run_colors, chunks)
 
     return rle
 
@@ -240,10 +469,10 @@ def generate_c_header(slice_data: List[dict]) -> str:
                      f"({ratio:.1f}x compression)")
         lines.append(f"const uint8_t map_slice_{name}[] PROGMEM = {{")
 
-        for i in range(0, len(rle), 8):
-            chunk = rle[i:i + 8]
-            formatted = ", ".join(f"{count}, {color}" for count, color in chunk)
-            lines.append(f"    {formatted},")
+        # 8 (count, color) pairs per line; str() over a flat int list runs in C
+        values = list(map(str, rle.ravel().tolist()))
+        for i in range(0, len(values), 16):
+            lines.append(f"    {', '.join(values[i:i + 16])},")
 
         lines.append("};")
         lines.append(f"const size_t map_slice_{name}_size = sizeof(map_slice_{name});")
@@ -305,8 +534,15 @@ def generate_zoom_binary(zoom_level: int, all_slice_bitmaps: List[List[List[byte
     return header + b"".join(index_entries) + b"".join(data_chunks)
 
 
-def get_sub_bounds(slice_def: dict, zoom: int, col: int, row: int):
-    """Calculate geographic bounds for a zoom sub-map."""
+def get_sub_bounds(slice_def: dict, zoom: int, col: int, row: int
+                   ) -> Tuple[Tuple[float, float, float, float], Tuple[int, int, int, int]]:
+    """
+    Calculate bounds for a zoom sub-map.
+
+    Returns:
+        ((lon_min, lon_max, lat_min, lat_max), (x0, y0, x1, y1)) where the
+        pixel bounds locate the sub-map in the slice rendered at zoom x size
+    """
     lon_min = slice_def["lon_min"]
     lon_max = slice_def["lon_max"]
 
@@ -328,7 +564,10 @@ def get_sub_bounds(slice_def: dict, zoom: int, col: int, row: int):
     sub_lat_max = 90.0 - row * lat_range
     sub_lat_min = sub_lat_max - lat_range
 
-    return sub_lon_min, sub_lon_max, sub_lat_min, sub_lat_max
+    x0, y0 = col * MAP_WIDTH, row * MAP_HEIGHT
+    pixel_bounds = (x0, y0, x0 + MAP_WIDTH, y0 + MAP_HEIGHT)
+
+    return (sub_lon_min, sub_lon_max, sub_lat_min, sub_lat_max), pixel_bounds
 
 
 def main():
@@ -349,14 +588,30 @@ def main():
         print(f"[ERROR] Error downloading Natural Earth data: {e}")
         sys.exit(1)
 
+    geometry_paths = {
+        "110m": (countries_path, borders_path),
+        "50m": (countries_50m_path, borders_50m_path),
+    }
+
     print()
     print("Loading geometries...")
-    countries = gpd.read_file(countries_path)
-    borders = gpd.read_file(borders_path)
-    countries_50m = gpd.read_file(countries_50m_path)
-    borders_50m = gpd.read_file(borders_50m_path)
-    print(f"[OK] 110m: {len(countries)} countries, {len(borders)} border segments")
-    print(f"[OK]  50m: {len(countries_50m)} countries, {len(borders_50m)} border segments")
+    geometries = load_geometries(geometry_paths)
+    for res, (countries, borders) in geometries.items():
+        print(f"[OK] {res:>4}: {len(countries)} countries, {len(borders)} border segments")
+    print(f"[OK] Renderer: {'rasterio' if rasterize is not None else 'matplotlib'}")
+    print()
+
+    # -- Render all slices at all zoom levels in parallel ----------
+    # Largest renders first (cost grows with zoom^2) so the pool doesn't
+    # finish on a tail of 5x slices while the other workers sit idle
+    work = [(s_idx, zoom)
+            for zoom in sorted([1] + ZOOM_LEVELS, reverse=True)
+            for s_idx in range(len(LONGITUDE_SLICES))]
+    workers = os.cpu_count() or 1
+    print(f"Rendering {len(work)} slice bitmaps on {workers} processes...")
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_render_worker,
+                             initargs=(geometry_paths,)) as executor:
+        rendered = dict(executor.map(render_and_encode, work))
     print()
 
     # -- 1x bitmaps (PROGMEM) --------------------------------------
@@ -366,16 +621,13 @@ def main():
 
     slice_data = []
 
-    for slice_def in LONGITUDE_SLICES:
-        print(f"\nRendering {slice_def['label']} ({slice_def['lon_range']})...")
+    for s_idx, slice_def in enumerate(LONGITUDE_SLICES):
+        print(f"\n{slice_def['label']} ({slice_def['lon_range']})")
 
-        bitmap = render_region(countries, borders,
-                               slice_def["lon_min"], slice_def["lon_max"],
-                               -90.0, 90.0)
-        rle = rle_compress(bitmap)
+        rle = rendered[(s_idx, 1)][0][0]
 
         original_size = MAP_WIDTH * MAP_HEIGHT
-        compressed_size = len(rle) * 2
+        compressed_size = rle.size
         ratio = original_size / compressed_size
 
         print(f"  [OK] {MAP_WIDTH}x{MAP_HEIGHT} = {original_size} bytes")
@@ -408,10 +660,7 @@ def main():
         print()
         print("-" * 50)
         # Use 50m data for high zoom levels
-        use_50m = zoom >= HIGH_RES_ZOOM_THRESHOLD
-        res_label = "50m" if use_50m else "110m"
-        z_countries = countries_50m if use_50m else countries
-        z_borders = borders_50m if use_50m else borders
+        res_label = "50m" if zoom >= HIGH_RES_ZOOM_THRESHOLD else "110m"
         print(f"  Generating {zoom}x zoom maps (LittleFS, {res_label} data)")
         print(f"  {4 * zoom * zoom} sub-maps ({zoom}x{zoom} grid per slice)")
         print("-" * 50)
@@ -420,26 +669,22 @@ def main():
         total_bytes = 0
 
         for s_idx, slice_def in enumerate(LONGITUDE_SLICES):
+            slice_rle = rendered[(s_idx, zoom)]
+
             slice_bitmaps = []
             for col in range(zoom):
                 col_bitmaps = []
                 for row in range(zoom):
-                    sub_lon_min, sub_lon_max, sub_lat_min, sub_lat_max = \
+                    (sub_lon_min, sub_lon_max, sub_lat_min, sub_lat_max), _ = \
                         get_sub_bounds(slice_def, zoom, col, row)
 
                     label = f"{slice_def['label']} [{col},{row}]"
                     print(f"  {label}: lon({sub_lon_min:.0f}..{sub_lon_max:.0f}) "
                           f"lat({sub_lat_min:.0f}..{sub_lat_max:.0f})", end="")
 
-                    bitmap = render_region(z_countries, z_borders,
-                                           sub_lon_min, sub_lon_max,
-                                           sub_lat_min, sub_lat_max)
-                    rle = rle_compress(bitmap)
+                    rle = slice_rle[col][row]
 
-                    # Convert RLE tuples to raw bytes
-                    rle_bytes = bytes()
-                    for count, color in rle:
-                        rle_bytes += bytes([count, color])
+                    rle_bytes = rle.tobytes()  # [count, color, count, color, ...]
 
                     total_bytes += len(rle_bytes)
                     print(f" -> {len(rle_bytes)} bytes")